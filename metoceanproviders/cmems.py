@@ -1,4 +1,4 @@
-"""Access to CMEMS[https://marine.copernicus.eu/] datasets, 
+"""Access to CMEMS[https://marine.copernicus.eu/] datasets,
 you will need to be registered and use your credentials"""
 
 import os
@@ -9,6 +9,21 @@ import xarray as xr
 
 from metoceanproviders.exceptions import CredentialsError
 
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+# Largest selection worth loading in one go; above this the dataset is kept
+# lazy and written in daily files instead of risking a multi-minute failed
+# download against the CMEMS response-size limit.
+CMEMS_MAX_BYTES = int(1.5 * 1024**3)
+
+# Authenticated CAS sessions, shared across instances so several dataset opens
+# in the same process pay the login round-trip only once.
+_session_cache = {}
+
 
 def _copernicusmarine_datastore(dataset, username, password):
     __author__ = "Copernicus Marine User Support Team"
@@ -22,24 +37,69 @@ def _copernicusmarine_datastore(dataset, username, password):
     from pydap.client import open_url
 
     cas_url = "https://cmems-cas.cls.fr/cas/login"
-    session = setup_session(cas_url, username, password)
-    try:
-        session.cookies.set("CASTGC", session.cookies.get_dict()["CASTGC"])
-    except:
-        raise CredentialsError(
-            username=username,
-            password=password,
-            message=f"\n\033[1;31mUsername or/and password are incorrect!\033[0;0m\n",
-        )
+    session = _session_cache.get((username, hash(password)))
+    if session is None:
+        session = setup_session(cas_url, username, password)
+        try:
+            session.cookies.set("CASTGC", session.cookies.get_dict()["CASTGC"])
+        except:
+            raise CredentialsError(
+                username=username,
+                password=password,
+                message=f"\n\033[1;31mUsername or/and password are incorrect!\033[0;0m\n",
+            )
+        _session_cache[(username, hash(password))] = session
 
     database = ["my", "nrt"]
     url = f"https://{database[0]}.cmems-du.eu/thredds/dodsC/{dataset}"
+    # Probe the host with a cheap HEAD request instead of paying a full
+    # Opendap DDS/DAS fetch just to discover the dataset lives in 'nrt'.
     try:
-        data_store = xr.backends.PydapDataStore(open_url(url, session=session))
+        found = session.head(f"{url}.html", timeout=5).status_code == 200
     except:
+        found = False
+    if not found:
         url = f"https://{database[1]}.cmems-du.eu/thredds/dodsC/{dataset}"
-        data_store = xr.backends.PydapDataStore(open_url(url, session=session))
-    return data_store
+    data_store = xr.backends.PydapDataStore(open_url(url, session=session))
+    return data_store, session, url
+
+
+def _dedup_times(t):
+    """Indices of the first occurrence of each value in a sorted 1-D array.
+    Uses a branch-predictable single-pass numba kernel when available (one
+    int64 buffer, no bool mask), with a vectorized numpy fallback."""
+    if numba is not None:
+        return _dedup_times_jit(t)
+    keep = np.empty(t.shape[0], dtype=bool)
+    keep[0] = True
+    np.not_equal(t[1:], t[:-1], out=keep[1:])
+    return np.flatnonzero(keep)
+
+
+if numba is not None:
+
+    @numba.njit(cache=True)
+    def _dedup_times_jit(t):
+        keep = np.empty(t.size, np.int64)
+        n = 1
+        keep[0] = 0
+        for i in range(1, t.size):
+            if t[i] != t[i - 1]:
+                keep[n] = i
+                n += 1
+        return keep[:n]
+
+
+def _lat_lng_to_ecef(lat, lon):
+    """Project geographic coordinates onto unit-sphere ECEF direction vectors,
+    so euclidean distance is monotonic with great-circle distance and nearest
+    searches stay correct across the dateline and near the poles."""
+    lat = np.radians(np.asarray(lat, dtype=float))
+    lon = np.radians(np.asarray(lon, dtype=float))
+    cos_lat = np.cos(lat)
+    return np.stack(
+        (cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)), axis=-1
+    )
 
 
 class CmemsOpendap:
@@ -48,6 +108,8 @@ class CmemsOpendap:
         dataset_id: str,
         username: str,
         password: str,
+        chunks: dict = {"time": 24},
+        regular_grid: bool = True,
     ):
         """Class to access CMEMS-dataset through Opendap service.
 
@@ -55,21 +117,81 @@ class CmemsOpendap:
             dataset_id (str): Id-name of the dataset. Defaults to None.
             username (str, optional): Username to login in CMEMS service. Defaults to None.
             password (str, optional): Password to login in CMEMS service. Defaults to None.
+            chunks (dict, optional): Dask chunk sizes used to open the remote dataset
+                lazily, so downloads are streamed chunk by chunk instead of in one
+                Opendap request. Defaults to {"time": 24}.
+            regular_grid (bool, optional): Assume evenly spaced coordinates, so
+                grid steps are taken from the axis ends instead of scanning the
+                full axis. Set False for irregular grids. Defaults to True.
 
         """
 
         self.username = username
         self.password = password
-        self.dataset_id = dataset_id.lstrip().rstrip()
+        self.dataset_id = dataset_id.strip()
+        self.regular_grid = regular_grid
 
         # Connect to datastore
-        data_store = _copernicusmarine_datastore(dataset_id, username, password)
-        self.ds = xr.open_dataset(data_store)
+        data_store, self.session, self.url = _copernicusmarine_datastore(
+            dataset_id, username, password
+        )
+        # Skip CF time decoding on open: building calendar-aware datetimes for
+        # the full axis is one of the slowest parts of touching a remote
+        # dataset, and the dedup/crop arithmetic only needs raw ticks. The
+        # (much shorter) cropped time coordinate is decoded after crop.
+        self.ds = xr.open_dataset(data_store, chunks=chunks, decode_times=False)
+        self._kdtree = None
+        self._needs_daily_split = False
         print(
             f"\n\033[1;32m'{username}' is successfully connected to '{dataset_id}'\033[0;0m\n"
         )
 
+        self._drop_repeated_times()
         self.coords_standarization()
+        self._cache_coord_values()
+
+    def _cache_coord_values(self):
+        """Materialize the 1-D coordinate arrays once, so crop computations do
+        not re-trigger remote coordinate reads through the backend."""
+        self._time_vals = self.ds["time"].values
+        self._time_units = self.ds["time"].attrs.get("units")
+        self._time_calendar = self.ds["time"].attrs.get("calendar", "standard")
+        self._lon_vals = (
+            self.ds["longitude"].values if "longitude" in self.ds.coords else None
+        )
+        self._lat_vals = (
+            self.ds["latitude"].values if "latitude" in self.ds.coords else None
+        )
+
+    def _fetch_raw_times(self):
+        """Fetch only the raw time axis with a server-side constraint
+        expression ('?time'), so the duplicate check does not force a full
+        coordinate read through the backend. Falls back to the opened dataset
+        if the constrained request fails."""
+        from pydap.client import open_url
+
+        try:
+            return np.asarray(
+                open_url(f"{self.url}?time", session=self.session)["time"][:]
+            )
+        except:
+            return self.ds["time"].values
+
+    def _drop_repeated_times(self):
+        """Drop repeated time steps (known CMEMS issue) with a single linear
+        scan over the already sorted time axis, avoiding the sort and extra
+        allocations of np.unique."""
+        t = self._fetch_raw_times()
+        if t.shape[0] < 2:
+            return
+        if np.issubdtype(t.dtype, np.datetime64):
+            t = t.view("i8")
+        keep = _dedup_times(np.ascontiguousarray(t))
+        if keep.size != t.shape[0]:
+            print(
+                "\n\033[1;33mRepeated times detected, dropping duplicated time steps!\033[0;0m\n"
+            )
+            self.ds = self.ds.isel(time=keep)
 
     def coords_standarization(self):
         if "lon" in self.ds.coords:
@@ -94,96 +216,388 @@ class CmemsOpendap:
             longitudes (slice, optional): Longitudes range to be selected. Defaults to None.
             latitudes (slice, optional): Latutudes range to be selected. Defaults to None.
             depths (slice, optional): Depths range to be selected. Defaults to None.
-            method (str, optional): Method to make the coordinate selection. Defaults to "neareast_outside".
+            method (str, optional): Method to make the coordinate selection.
+                "neareast_outside" widens range selections by one grid step;
+                "nearest_robust" snaps scalar selections to the previous
+                coordinate (piecewise-constant) instead of the nearest one.
+                Defaults to "neareast_outside".
+
+        Raises:
+            KeyError: If a selection is given for a dimension the dataset does not have.
         """
 
+        # Fail fast on selections over missing dimensions, instead of silently
+        # downloading the un-cropped axis.
+        for name, selection in (
+            ("time", times),
+            ("longitude", longitudes),
+            ("latitude", latitudes),
+            ("depth", depths),
+        ):
+            if selection is not None and name not in self.ds.dims:
+                raise KeyError(
+                    f"'{name}' is not a dimension of '{self.dataset_id}', "
+                    f"available dimensions are {tuple(self.ds.dims)}"
+                )
+
+        # The undecoded time axis holds raw ticks (e.g. 'hours since
+        # 1950-01-01'); convert the requested datetimes to the same unit once.
+        if times is not None and not np.issubdtype(
+            self._time_vals.dtype, np.datetime64
+        ):
+            times = self._times_to_ticks(times)
+
         # Modify coordinates to make the selection based on the method desired
         if method == "neareast_outside":
-            # Calculate your domain and add 1 maximum dt, dx, dy as an outside buffer
+            # Calculate your domain and add 1 maximum dt, dx, dy as an outside buffer.
+            # Each coordinate array is materialized and reduced only once, to avoid
+            # repeated fetches over Opendap.
             if isinstance(times, slice):
-                times = slice(
-                    times.start
-                    - np.diff(self.ds["time"].values)
-                    .max()
-                    .astype("timedelta64[s]")
-                    .item(),
-                    times.stop
-                    + np.diff(self.ds["time"].values)
-                    .max()
-                    .astype("timedelta64[s]")
-                    .item(),
-                )
+                dt_max = self._max_step(self._time_vals)
+                if np.issubdtype(self._time_vals.dtype, np.datetime64):
+                    dt_max = dt_max.astype("timedelta64[s]").item()
+                times = slice(times.start - dt_max, times.stop + dt_max)
 
             if isinstance(longitudes, slice):
+                dlon_max = self._max_step(self._lon_vals)
                 longitudes = slice(
-                    longitudes.start - np.diff(self.ds["longitude"].values).max(),
-                    longitudes.stop + np.diff(self.ds["longitude"].values).max(),
+                    longitudes.start - dlon_max, longitudes.stop + dlon_max
                 )
 
             if isinstance(latitudes, slice):
-                latitudes = slice(
-                    latitudes.start - np.diff(self.ds["latitude"].values).max(),
-                    latitudes.stop + np.diff(self.ds["latitude"].values).max(),
-                )
-
-        # Make the selection of coordinates
+                dlat_max = self._max_step(self._lat_vals)
+                latitudes = slice(latitudes.start - dlat_max, latitudes.stop + dlat_max)
+
+        # Resolve every selection locally into contiguous positional slices and
+        # make a single isel call, so pydap issues one hyperslab request instead
+        # of per-axis round-trips with fancy indexing.
+        # "nearest_robust" snaps scalars to the previous coordinate instead of
+        # the nearest one, so the pick stays stable under repeated timestamps
+        # or coordinate round-off.
+        snap = "previous" if method == "nearest_robust" else "nearest"
+        indexers = {}
         if times is not None:
-            if isinstance(times, slice):
-                self.ds = self.ds.sel(time=times)
-            else:
-                self.ds = self.ds.sel(time=times, method="nearest")
-
-        if longitudes is not None:
-            if isinstance(longitudes, slice):
-                self.ds = self.ds.sel(longitude=longitudes)
-            else:
-                self.ds = self.ds.sel(longitude=longitudes, method="nearest")
-
-        if latitudes is not None:
-            if isinstance(latitudes, slice):
-                self.ds = self.ds.sel(latitude=latitudes)
-            else:
-                self.ds = self.ds.sel(latitude=latitudes, method="nearest")
-
+            indexers["time"] = self._index_range(self._time_vals, times, snap)
+        scalar_point = not isinstance(longitudes, slice) and not isinstance(
+            latitudes, slice
+        )
+        if (
+            longitudes is not None
+            and latitudes is not None
+            and scalar_point
+            and snap == "nearest"
+        ):
+            # Scalar probe: resolve both horizontal axes at once through the
+            # great-circle-correct KDTree instead of two per-axis searches.
+            iy, ix = self._nearest_grid_point(latitudes, longitudes)
+            indexers["latitude"] = slice(iy, iy + 1)
+            indexers["longitude"] = slice(ix, ix + 1)
+        else:
+            if longitudes is not None:
+                indexers["longitude"] = self._index_range(
+                    self._lon_vals, longitudes, snap
+                )
+            if latitudes is not None:
+                indexers["latitude"] = self._index_range(
+                    self._lat_vals, latitudes, snap
+                )
         if depths is not None:
-            if isinstance(depths, slice):
-                self.ds = self.ds.sel(detph=depths)
-            else:
-                self.ds = self.ds.sel(detph=depths, method="nearest")
+            indexers["depth"] = self._index_range(self.ds["depth"].values, depths, snap)
+        if indexers:
+            self.ds = self.ds.isel(indexers)
+            self._kdtree = None
+            self._decode_time_coord()
+            self._cache_coord_values()
 
         # Make the selection of variables
         if variables is not None:
             self.ds = self.ds.get(variables)
-        try:
+
+        # Decide the download strategy upfront from the estimated size, instead
+        # of paying a long failed request against the CMEMS size limit.
+        estimated_bytes = sum(
+            var.size * var.dtype.itemsize for var in self.ds.data_vars.values()
+        )
+        self._needs_daily_split = estimated_bytes >= CMEMS_MAX_BYTES
+        if not self._needs_daily_split:
             self.ds.load()
-        except:
-            print("\n\033[1;33mToo big to be loaded in one request!\033[0;0m\n")
 
-    def to_netcdf(self, output_path: str, netcdf_format: str = None):
+    def _max_step(self, coord):
+        """Maximum grid step of a sorted 1-D coordinate. On regular grids (the
+        usual CMEMS case) the first and last steps bound the maximum, so only
+        four elements are read instead of scanning the full axis."""
+        if self.regular_grid and coord.size >= 2:
+            return max(coord[1] - coord[0], coord[-1] - coord[-2])
+        return np.diff(coord).max()
+
+    def _times_to_ticks(self, times):
+        """Convert user-supplied datetimes into the dataset's raw time ticks
+        with a single cftime.date2num call, so no per-timestamp calendar
+        objects are built. Numeric values pass through untouched."""
+        import cftime
+
+        def to_ticks(value):
+            if value is None or isinstance(value, (int, float, np.number)):
+                return value
+            return cftime.date2num(value, self._time_units, self._time_calendar)
+
+        if isinstance(times, slice):
+            return slice(to_ticks(times.start), to_ticks(times.stop))
+        return to_ticks(times)
+
+    def _decode_time_coord(self):
+        """Decode the (already cropped, hence short) raw time ticks into
+        datetime64, restoring calendar-aware times for downstream consumers."""
+        from xarray.coding.times import decode_cf_datetime
+
+        time = self.ds["time"]
+        if self._time_units is None or np.issubdtype(time.dtype, np.datetime64):
+            return
+        self.ds = self.ds.assign_coords(
+            time=decode_cf_datetime(time.values, self._time_units, self._time_calendar)
+        )
+
+    @staticmethod
+    def _index_range(coord, selection, snap="nearest"):
+        """Resolve a label slice or scalar over a sorted 1-D coordinate into a
+        contiguous positional slice. Slices keep both endpoints (as label-based
+        selection does); scalars snap to the nearest coordinate, or with
+        snap="previous" to the previous one (piecewise-constant, as
+        interp(method='zero') would), which stays unambiguous under repeated
+        timestamps or cell-center round-off. Open-ended slices keep the whole
+        axis on the open side, as label-based selection does. Descending axes
+        (e.g. north-to-south latitude) are supported with either bound order."""
+        if isinstance(selection, slice) and selection.step is not None:
+            raise ValueError("step is not supported in coordinate slices")
+
+        if coord.size > 1 and coord[0] > coord[-1]:
+            # Descending axis: resolve against the ascending reversed view and
+            # map the positional slice back.
+            if isinstance(selection, slice):
+                if selection.start is not None and selection.stop is not None:
+                    lo, hi = sorted((selection.start, selection.stop))
+                    selection = slice(lo, hi)
+                else:
+                    # An open start means "from the highest value", which is an
+                    # open stop on the ascending view, and vice versa.
+                    selection = slice(selection.stop, selection.start)
+            resolved = CmemsOpendap._index_range(coord[::-1], selection, snap)
+            return slice(coord.size - resolved.stop, coord.size - resolved.start)
+
+        def as_coord_value(value):
+            # Datetime axes need an explicit cast from datetime objects, but
+            # numeric ticks must stay uncast: casting float ticks to an
+            # integer axis dtype would truncate them (4.9 h -> 4 h), so numpy
+            # is left to promote for the comparison instead.
+            if np.issubdtype(coord.dtype, np.datetime64):
+                return np.asarray(value, dtype=coord.dtype)
+            return np.asarray(value)
+
+        if isinstance(selection, slice):
+            i0 = 0
+            if selection.start is not None:
+                i0 = int(
+                    np.searchsorted(coord, as_coord_value(selection.start), side="left")
+                )
+            i1 = coord.size
+            if selection.stop is not None:
+                i1 = int(
+                    np.searchsorted(coord, as_coord_value(selection.stop), side="right")
+                )
+            return slice(i0, i1)
+
+        value = as_coord_value(selection)
+        if snap == "previous":
+            i = max(int(np.searchsorted(coord, value, side="right")) - 1, 0)
+            return slice(i, i + 1)
+
+        i = int(np.searchsorted(coord, value))
+        if i == coord.size or (i > 0 and value - coord[i - 1] <= coord[i] - value):
+            i -= 1
+        return slice(i, i + 1)
+
+    def _nearest_grid_point(self, latitude, longitude):
+        """Find the grid node nearest to a scalar (latitude, longitude) probe.
+
+        Builds a KDTree on ECEF-projected grid coordinates once per dataset,
+        so each probe costs O(log M) instead of a linear scan per axis."""
+        from scipy.spatial import cKDTree
+
+        lat_vals = self._lat_vals
+        lon_vals = self._lon_vals
+        if self._kdtree is None:
+            lat2d, lon2d = np.meshgrid(lat_vals, lon_vals, indexing="ij")
+            self._kdtree = cKDTree(_lat_lng_to_ecef(lat2d.ravel(), lon2d.ravel()))
+        _, flat_index = self._kdtree.query(_lat_lng_to_ecef(latitude, longitude))
+        iy, ix = np.unravel_index(flat_index, (lat_vals.size, lon_vals.size))
+        return int(iy), int(ix)
+
+    @staticmethod
+    def _fast_concat(datasets, dim):
+        """Concatenate already aligned in-memory datasets along one dimension
+        with direct np.concatenate calls, skipping xarray's alignment and
+        broadcasting pass (several times the memory of the raw concatenation)."""
+        first = datasets[0]
+        coords = {
+            name: (first[name].dims, first[name].values, first[name].attrs)
+            for name in first.coords
+            if name != dim
+        }
+        coords[dim] = (
+            (dim,),
+            np.concatenate([dataset[dim].values for dataset in datasets]),
+            first[dim].attrs,
+        )
+        data_vars = {}
+        for name, var in first.data_vars.items():
+            if dim in var.dims:
+                values = np.concatenate(
+                    [dataset[name].values for dataset in datasets],
+                    axis=var.dims.index(dim),
+                )
+            else:
+                values = var.values
+            data_vars[name] = (var.dims, values, var.attrs)
+        return xr.Dataset(data_vars, coords=coords, attrs=first.attrs)
+
+    def chunked_fetch(self, n_workers: int = 8):
+        """Load the current (cropped) selection into memory by splitting the
+        time range in sub-requests issued concurrently. The authenticated
+        session is reused across threads, so each worker only pays the Opendap
+        hyperslab request and the network latency overlaps between workers.
+
+        Args:
+            n_workers (int, optional): Number of concurrent sub-requests. Defaults to 8.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        n_times = self.ds["time"].size
+        bounds = np.linspace(0, n_times, min(n_workers, n_times) + 1, dtype=int)
+        time_slices = [slice(i0, i1) for i0, i1 in zip(bounds[:-1], bounds[1:])]
+
+        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+            datasets = list(
+                executor.map(
+                    lambda time_slice: self.ds.isel(time=time_slice).load(),
+                    time_slices,
+                )
+            )
+        self.ds = self._fast_concat(datasets, dim="time")
+
+    def to_netcdf(
+        self,
+        output_path: str,
+        netcdf_format: str = None,
+        compress: int = 4,
+        chunksizes: dict = None,
+        engine: str = "h5netcdf",
+        zarr: bool = False,
+    ):
         """Save data in netCDF files.
         If the download exceded the maximum size allowed by CMEMS Opendap service,
         the dataset is splited by day and saved in daily netCDF files.
 
         Args:
             output_path (str): path to the desired file.
-            netcdf_format (str, optional): to specify the specific netcdf format, check availables in xarray documentation. Defaults to None.
+            netcdf_format (str, optional): to specify the specific netcdf format, check
+                availables in xarray documentation. Formats other than NETCDF4 fall
+                back to xarray's default engine choice, and the classic NETCDF3
+                formats are written without compression. Defaults to None.
+            compress (int, optional): deflate compression level (1-9) applied to every
+                data variable, None to write uncompressed. Defaults to 4.
+            chunksizes (dict, optional): netCDF chunk sizes per variable name. Defaults
+                to one timestep per chunk (1, latitude, longitude).
+            engine (str, optional): xarray netCDF write engine; h5netcdf writes
+                through native HDF5 and is noticeably faster than the netCDF4
+                default, but only supports the NETCDF4 format. Defaults to "h5netcdf".
+            zarr (bool, optional): write a zarr store (directory of chunks with
+                Blosc/zstd compression) instead of netCDF, ideal for cloud
+                storage and parallel chunk writes. Defaults to False.
         """
-        try:
-            self.ds.to_netcdf(output_path, format=netcdf_format)
-            paths = list()
-            paths.append(output_path)
-        except:
-            paths = self._to_daily_netcdf(output_path, netcdf_format)
+        if zarr:
+            import numcodecs
+
+            compressor = numcodecs.Blosc(cname="zstd", clevel=3)
+            self.ds.to_zarr(
+                output_path,
+                mode="w",
+                encoding={var: {"compressor": compressor} for var in self.ds.data_vars},
+            )
+            return [output_path]
+
+        if netcdf_format is not None and netcdf_format.upper() != "NETCDF4":
+            # h5netcdf only writes NETCDF4; let xarray pick the engine for the
+            # requested format instead.
+            engine = None
+            if not netcdf_format.upper().startswith("NETCDF4"):
+                # The classic NETCDF3 formats cannot hold deflate/chunk settings.
+                compress = None
+
+        encoding = self._netcdf_encoding(compress, chunksizes)
+        if self._needs_daily_split:
+            paths = self._to_daily_netcdf(output_path, netcdf_format, encoding, engine)
+        else:
+            self.ds.to_netcdf(
+                output_path, format=netcdf_format, encoding=encoding, engine=engine
+            )
+            paths = [output_path]
 
         return paths
 
-    def _to_daily_netcdf(self, output_path, netcdf_format=None):
+    def _netcdf_encoding(self, compress, chunksizes=None):
+        """Build a deflate + per-timestep-chunk encoding for every data variable."""
+        if compress is None:
+            return None
+        encoding = {}
+        for name, var in self.ds.data_vars.items():
+            if chunksizes is not None:
+                var_chunksizes = chunksizes.get(name)
+            else:
+                # One timestep per chunk: good for both sequential reads and
+                # random access in time.
+                var_chunksizes = tuple(
+                    1 if dim == "time" else self.ds.sizes[dim] for dim in var.dims
+                )
+            encoding[name] = {
+                "zlib": True,
+                "complevel": compress,
+                "shuffle": True,
+                "chunksizes": var_chunksizes,
+            }
+        return encoding
+
+    def _to_daily_netcdf(
+        self, output_path, netcdf_format=None, encoding=None, engine="h5netcdf"
+    ):
         output_dir = os.path.dirname(output_path)
         filename, file_ext = os.path.splitext(os.path.basename(output_path))
 
-        date, datasets = zip(*self.ds.groupby("time.date"))
-        paths = [f"{output_dir}/{filename}_{d}{file_ext}" for d in date]
-        xr.save_mfdataset(datasets, paths, format=netcdf_format)
+        # Make sure the time axis is decoded (it stays as raw ticks if crop
+        # was never called) before flooring it to days.
+        self._decode_time_coord()
+        self._cache_coord_values()
+
+        # Group by day with a vectorized floor-to-day instead of groupby
+        # ("time.date"), which builds a Python date object per timestamp.
+        # The unique indices give contiguous time slices per day.
+        days = self.ds["time"].values.astype("datetime64[D]")
+        dates, starts = np.unique(days, return_index=True)
+        ends = np.r_[starts[1:], days.size]
+
+        # Keep the daily slices lazy: with a dask-backed dataset save_mfdataset
+        # schedules the file writes in parallel with bounded per-task memory,
+        # instead of realizing every day in memory before writing.
+        datasets = [self.ds.isel(time=slice(s, e)) for s, e in zip(starts, ends)]
+        if encoding is not None:
+            # save_mfdataset takes no encoding argument, so attach it to the
+            # variables of each daily dataset instead.
+            for dataset in datasets:
+                for name, var_encoding in encoding.items():
+                    dataset[name].encoding.update(var_encoding)
+        paths = [f"{output_dir}/{filename}_{d}{file_ext}" for d in dates]
+        xr.save_mfdataset(
+            datasets, paths, format=netcdf_format, engine=engine, compute=True
+        )
 
         return paths
 
@@ -1,16 +1,21 @@
 import os
 from datetime import datetime, timedelta
 
+import numpy as np
 import pandas as pd
 import pytest
 import xarray as xr
+from metoceanproviders import cmems
 from metoceanproviders.cmems import (
     CredentialsError,
     CmemsOpendap,
     _copernicusmarine_datastore,
+    _dedup_times,
+    _lat_lng_to_ecef,
 )
 
 from dotenv import load_dotenv
+
 load_dotenv(".env")
 
 CMEMS_USERNAME = os.environ.get("CMEMS_USERNAME")
@@ -53,7 +58,11 @@ class TestOpendap:
 
     @pytest.fixture(scope="class")
     def data(self, times, longitudes, latitudes):
-        data = CmemsOpendap("cmems_mod_glo_phy_anfc_merged-uv_PT1H-i",username=CMEMS_USERNAME, password=CMEMS_PASSWORD)
+        data = CmemsOpendap(
+            "cmems_mod_glo_phy_anfc_merged-uv_PT1H-i",
+            username=CMEMS_USERNAME,
+            password=CMEMS_PASSWORD,
+        )
         data.crop(None, times, longitudes, latitudes)
         return data
 
@@ -87,3 +96,202 @@ class TestOpendap:
         paths = data._to_daily_netcdf(output_path)
         ds = xr.open_mfdataset(paths)
         assert ds == data.ds
+
+
+def synthetic_opendap(ds):
+    """Build a CmemsOpendap around an in-memory dataset, skipping the remote
+    connection done in __init__."""
+    data = CmemsOpendap.__new__(CmemsOpendap)
+    data.dataset_id = "synthetic"
+    data.regular_grid = True
+    data.ds = ds
+    data._kdtree = None
+    data._needs_daily_split = False
+    data._cache_coord_values()
+    return data
+
+
+@pytest.fixture()
+def synthetic_data():
+    ds = xr.Dataset(
+        {
+            "u": (
+                ("time", "latitude", "longitude"),
+                np.arange(48 * 5 * 4, dtype="float32").reshape(48, 5, 4),
+            )
+        },
+        coords={
+            "time": (
+                "time",
+                np.arange(48, dtype=np.int64),
+                {"units": "hours since 2022-01-01"},
+            ),
+            "latitude": np.linspace(35.0, 45.0, 5),
+            "longitude": np.array([-4.0, -1.0, 2.0, 5.0]),
+        },
+    )
+    return synthetic_opendap(ds)
+
+
+class TestIndexRange:
+    coord = np.array([0.0, 1.0, 2.0, 3.0, 4.0])
+
+    def test_slice_keeps_endpoints(self):
+        assert CmemsOpendap._index_range(self.coord, slice(1.0, 3.0)) == slice(1, 4)
+
+    def test_open_ended_slices(self):
+        assert CmemsOpendap._index_range(self.coord, slice(None, 2.0)) == slice(0, 3)
+        assert CmemsOpendap._index_range(self.coord, slice(2.0, None)) == slice(2, 5)
+        assert CmemsOpendap._index_range(self.coord, slice(None, None)) == slice(0, 5)
+
+    def test_step_rejected(self):
+        with pytest.raises(ValueError):
+            CmemsOpendap._index_range(self.coord, slice(0.0, 4.0, 2))
+
+    def test_scalar_nearest(self):
+        assert CmemsOpendap._index_range(self.coord, 2.4) == slice(2, 3)
+        assert CmemsOpendap._index_range(self.coord, 2.6) == slice(3, 4)
+        assert CmemsOpendap._index_range(self.coord, -10.0) == slice(0, 1)
+        assert CmemsOpendap._index_range(self.coord, 10.0) == slice(4, 5)
+
+    def test_scalar_previous(self):
+        assert CmemsOpendap._index_range(self.coord, 2.6, "previous") == slice(2, 3)
+        assert CmemsOpendap._index_range(self.coord, -10.0, "previous") == slice(0, 1)
+
+    def test_float_ticks_on_integer_axis(self):
+        coord = np.arange(10, dtype=np.int64)
+        assert CmemsOpendap._index_range(coord, 4.9) == slice(5, 6)
+        assert CmemsOpendap._index_range(coord, 4.4) == slice(4, 5)
+        assert CmemsOpendap._index_range(coord, slice(4.9, 7.1)) == slice(5, 8)
+
+
+class TestIndexRangeDescending:
+    coord = np.array([45.0, 42.5, 40.0, 37.5, 35.0])
+
+    def test_slice_any_bound_order(self):
+        assert CmemsOpendap._index_range(self.coord, slice(37.0, 42.0)) == slice(2, 4)
+        assert CmemsOpendap._index_range(self.coord, slice(42.0, 37.0)) == slice(2, 4)
+
+    def test_open_ended_slices(self):
+        assert CmemsOpendap._index_range(self.coord, slice(None, 40.0)) == slice(0, 3)
+        assert CmemsOpendap._index_range(self.coord, slice(40.0, None)) == slice(2, 5)
+        assert CmemsOpendap._index_range(self.coord, slice(None, None)) == slice(0, 5)
+
+    def test_scalar_nearest(self):
+        assert CmemsOpendap._index_range(self.coord, 41.0) == slice(2, 3)
+        assert CmemsOpendap._index_range(self.coord, 38.0) == slice(3, 4)
+        assert CmemsOpendap._index_range(self.coord, 100.0) == slice(0, 1)
+        assert CmemsOpendap._index_range(self.coord, -100.0) == slice(4, 5)
+
+
+class TestDedupTimes:
+    def test_duplicates_dropped(self):
+        t = np.array([0, 1, 1, 2, 3, 3, 3, 4], dtype=np.int64)
+        assert list(_dedup_times(t)) == [0, 1, 3, 4, 7]
+
+    def test_monotonic_unchanged(self):
+        t = np.arange(10, dtype=np.int64)
+        assert list(_dedup_times(t)) == list(range(10))
+
+    @pytest.mark.skipif(cmems.numba is None, reason="numba is not installed")
+    def test_numba_kernel_matches_numpy(self):
+        t = np.array([0, 0, 1, 2, 2, 3], dtype=np.int64)
+        keep = np.empty(t.size, dtype=bool)
+        keep[0] = True
+        np.not_equal(t[1:], t[:-1], out=keep[1:])
+        assert list(cmems._dedup_times_jit(t)) == list(np.flatnonzero(keep))
+
+
+class TestMaxStep:
+    def test_regular_grid_reads_ends(self, synthetic_data):
+        coord = np.array([0.0, 1.0, 5.0, 6.0])
+        assert synthetic_data._max_step(coord) == 1.0
+        synthetic_data.regular_grid = False
+        assert synthetic_data._max_step(coord) == 4.0
+
+
+class TestNearestGridPoint:
+    def test_ecef_projection(self):
+        np.testing.assert_allclose(_lat_lng_to_ecef(0.0, 0.0), [1.0, 0.0, 0.0])
+        np.testing.assert_allclose(
+            _lat_lng_to_ecef(90.0, 0.0), [0.0, 0.0, 1.0], atol=1e-12
+        )
+
+    def test_scalar_point_crop(self, synthetic_data):
+        pytest.importorskip("scipy")
+        synthetic_data.crop(longitudes=-0.9, latitudes=38.1, method="nearest")
+        assert synthetic_data.ds.longitude.values.tolist() == [-1.0]
+        assert synthetic_data.ds.latitude.values.tolist() == [37.5]
+
+
+class TestFastConcat:
+    def test_matches_xr_concat(self, synthetic_data):
+        ds = synthetic_data.ds
+        parts = [ds.isel(time=slice(0, 30)), ds.isel(time=slice(30, 48))]
+        combined = CmemsOpendap._fast_concat(parts, "time")
+        assert combined.identical(xr.concat(parts, dim="time"))
+
+
+class TestNetcdfEncoding:
+    def test_one_timestep_per_chunk(self, synthetic_data):
+        encoding = synthetic_data._netcdf_encoding(4)
+        assert encoding["u"]["zlib"] is True
+        assert encoding["u"]["complevel"] == 4
+        assert encoding["u"]["chunksizes"] == (1, 5, 4)
+
+    def test_no_compression(self, synthetic_data):
+        assert synthetic_data._netcdf_encoding(None) is None
+
+
+class TestCropOffline:
+    def test_open_ended_slice_keeps_data(self, synthetic_data):
+        synthetic_data.crop(latitudes=slice(None, 39.0), method="nearest")
+        assert synthetic_data.ds.latitude.values.tolist() == [35.0, 37.5]
+
+    def test_outside_buffer_and_time_decoding(self, synthetic_data):
+        times = slice(datetime(2022, 1, 1, 5), datetime(2022, 1, 1, 12))
+        synthetic_data.crop(times=times, longitudes=slice(-1.0, 2.0))
+        assert synthetic_data.ds.time.dtype.kind == "M"
+        assert pd.Timestamp(synthetic_data.ds.time.values.min()) <= times.start
+        assert pd.Timestamp(synthetic_data.ds.time.values.max()) >= times.stop
+        assert synthetic_data.ds.longitude.values.min() <= -1.0
+        assert synthetic_data.ds.longitude.values.max() >= 2.0
+
+    def test_nearest_robust_snaps_previous(self, synthetic_data):
+        synthetic_data.crop(longitudes=4.0, latitudes=39.0, method="nearest_robust")
+        assert synthetic_data.ds.longitude.values.tolist() == [2.0]
+        assert synthetic_data.ds.latitude.values.tolist() == [37.5]
+
+    def test_scalar_time_nearest_on_integer_ticks(self, synthetic_data):
+        synthetic_data.crop(times=datetime(2022, 1, 1, 4, 54), method="nearest")
+        assert pd.Timestamp(synthetic_data.ds.time.values[0]) == pd.Timestamp(
+            "2022-01-01T05"
+        )
+
+    def test_missing_dimension_raises(self, synthetic_data):
+        with pytest.raises(KeyError):
+            synthetic_data.crop(depths=slice(0.0, 10.0))
+
+    def test_descending_latitude_axis(self, synthetic_data):
+        descending = synthetic_data.ds.isel(latitude=slice(None, None, -1))
+        data = synthetic_opendap(descending)
+        data.crop(latitudes=slice(37.0, 42.0), method="nearest")
+        assert data.ds.latitude.values.tolist() == [40.0, 37.5]
+
+
+class TestChunkedFetch:
+    def test_matches_original(self, synthetic_data):
+        expected = synthetic_data.ds
+        synthetic_data.chunked_fetch(n_workers=3)
+        assert synthetic_data.ds.identical(expected)
+
+
+class TestDailyNetcdfOffline:
+    def test_daily_files(self, tmpdir, synthetic_data):
+        pytest.importorskip("h5netcdf")
+        output_path = os.path.join(tmpdir, "synthetic.nc")
+        paths = synthetic_data._to_daily_netcdf(output_path)
+        assert len(paths) == 2
+        assert all(os.path.exists(path) for path in paths)
+        ds = xr.open_mfdataset(paths)
+        assert ds.time.size == 48